@@ -0,0 +1,217 @@
+# benchmarks/run.py
+#
+# Benchmark harness for the engine, rules, rewrite and blockchain hot paths.
+#
+#   python -m benchmarks.run                          # 3×3 … 30×30 grids
+#   python -m benchmarks.run --stress                 # adds 50×50 and 100×100
+#   python -m benchmarks.run --output bench.json
+#   python -m benchmarks.run --baseline bench.json --threshold 1.25
+#
+# Results are written as JSON keyed by benchmark name. With --baseline, any
+# timing or peak memory that grew by more than --threshold× (and by more than
+# the --min-delta-ms / --min-delta-kb noise floors) is reported and the exit code is 1.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from blockchain.chain import Blockchain
+from core import rules
+from core.engine import CognitiveGraphEngine
+from core.rewrite import parse_rewrite_candidates, resolve_grid_from_candidates
+from main import build_graph_from_grid
+
+GRID_SIZES = [3, 5, 10, 20, 30]
+STRESS_SIZES = [50, 100]
+
+def synthetic_grid(size: int, density: float = 0.3, seed: int = 0) -> List[List[int]]:
+    """
+    ARC-style grid: mostly background with random colours 1-9 at `density`.
+    """
+    rng = random.Random(seed * 1000 + size)
+    return [[rng.randint(1, 9) if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+def timed(fn: Callable[[], Any]) -> float:
+    """
+    Wall time of a single call in seconds, engine logging suppressed.
+    For stateful work (engine steps) that cannot be repeated as-is.
+    """
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+def timed_per_call(fn: Callable[[], Any], rounds: int = 3) -> float:
+    """
+    Per-call time in seconds for repeatable work: each round loops `fn` via
+    timeit's autorange (at least 0.2s total), and the best round is kept.
+    """
+    timer = timeit.Timer(fn)
+    best = float('inf')
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        for _ in range(rounds):
+            number, total = timer.autorange()
+            best = min(best, total / number)
+    return best
+
+def _build_engine(size: int) -> CognitiveGraphEngine:
+    rules.psi_memory.clear()
+    engine = CognitiveGraphEngine()
+    build_graph_from_grid(engine, synthetic_grid(size))
+    return engine
+
+def bench_engine(size: int, steps: int, rounds: int = 3) -> Dict[str, Any]:
+    # Timed passes run untraced: tracemalloc would inflate step latency several times.
+    # Steps mutate the graph, so each round replays them on a fresh engine and the
+    # fastest time per step is kept.
+    step_times = [float('inf')] * steps
+    for _ in range(rounds):
+        engine = _build_engine(size)
+        node_counts = [engine.graph.graph.number_of_nodes()]
+        for i in range(steps):
+            step_times[i] = min(step_times[i], timed(engine.step))
+            node_counts.append(engine.graph.graph.number_of_nodes())
+    # engine.predict_grid_from_graph() feeds node ids (not labels) to the parser and so
+    # resolves nothing; time the same parse + resolve on the real node labels instead
+    labels = [wrapper['data'].label for _, wrapper in engine.graph.graph.nodes(data=True)]
+    prediction_time = timed_per_call(lambda: resolve_grid_from_candidates(parse_rewrite_candidates(labels), size, size))
+
+    # Separate traced pass over a fresh engine for peak memory
+    engine = _build_engine(size)
+    tracemalloc.start()
+    timed(lambda: engine.run(steps))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'step_times_s': step_times,
+        'step_time_total_s': sum(step_times),
+        'peak_memory_bytes': peak,
+        'nodes_per_step': node_counts,
+        'prediction_time_s': prediction_time,
+    }
+
+def bench_rewrite(size: int) -> Dict[str, Any]:
+    # Cell labels plus echo labels at every amplification depth up to the rule cap
+    labels = [f"({x},{y})={v}" + "_amp" * depth
+              for y, row in enumerate(synthetic_grid(size, density=1.0))
+              for x, v in enumerate(row)
+              for depth in range(5)]
+    candidates = parse_rewrite_candidates(labels)
+    return {
+        'labels': len(labels),
+        'parse_time_s': timed_per_call(lambda: parse_rewrite_candidates(labels)),
+        'resolve_time_s': timed_per_call(lambda: resolve_grid_from_candidates(candidates, size, size)),
+    }
+
+def _fill_chain(blocks: int) -> Blockchain:
+    chain = Blockchain()
+    for i in range(blocks):
+        chain.add_block({'soul_echo': i * 0.01, 'truth_cost': i * 0.005})
+    return chain
+
+def bench_blockchain(blocks: int) -> Dict[str, Any]:
+    append_time = timed_per_call(lambda: _fill_chain(blocks))
+    chain = _fill_chain(blocks)
+    validate_time = timed_per_call(chain.is_valid)
+    return {
+        'blocks': blocks,
+        'append_time_s': append_time,
+        'append_per_s': blocks / append_time if append_time else float('inf'),
+        'validate_time_s': validate_time,
+        'validate_blocks_per_s': len(chain.chain) / validate_time if validate_time else float('inf'),
+    }
+
+def run_suite(sizes: List[int], steps: int, blocks: int) -> Dict[str, Any]:
+    results = {}
+    for size in sizes:
+        results[f"engine/{size}x{size}"] = bench_engine(size, steps)
+        results[f"rewrite/{size}x{size}"] = bench_rewrite(size)
+        print(f"  {size}x{size}: step {results[f'engine/{size}x{size}']['step_time_total_s']:.4f}s", file=sys.stderr)
+    results[f"blockchain/{blocks}"] = bench_blockchain(blocks)
+    return results
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_delta_s: float = 1e-3, min_delta_bytes: int = 64 * 1024) -> List[str]:
+    """
+    List timings (keys ending in `_time_s`) and peak memory (keys ending in `_bytes`)
+    that grew beyond `threshold`× the baseline. Changes smaller than the absolute
+    noise floors are ignored, so microsecond timings cannot trip the check.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline.get(name, {})
+        for key, value in metrics.items():
+            if key.endswith('_time_s'):
+                floor, unit, scale = min_delta_s, 's', 1.0
+            elif key.endswith('_bytes'):
+                floor, unit, scale = min_delta_bytes, ' KiB', 1 / 1024
+            else:
+                continue
+            if key not in previous or not previous[key]:
+                continue
+            ratio = value / previous[key]
+            if ratio > threshold and value - previous[key] > floor:
+                regressions.append(f"{name} {key}: {previous[key] * scale:.6f}{unit} → {value * scale:.6f}{unit} ({ratio:.2f}×)")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cognitive Graph Engine benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=GRID_SIZES, help="grid side lengths")
+    parser.add_argument('--stress', action='store_true', help="also run stress sizes " + str(STRESS_SIZES))
+    parser.add_argument('--steps', type=int, default=3, help="engine steps per grid")
+    parser.add_argument('--blocks', type=int, default=1000, help="blocks to append/validate")
+    parser.add_argument('--output', default='benchmarks/results.json', help="where to write JSON results")
+    parser.add_argument('--baseline', help="previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="allowed slowdown ratio vs baseline")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="ignore timing changes smaller than this")
+    parser.add_argument('--min-delta-kb', type=float, default=64.0, help="ignore peak memory changes smaller than this")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        if os.path.abspath(args.baseline) == os.path.abspath(args.output):
+            parser.error("--baseline and --output are the same file; the run would overwrite its own baseline")
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    sizes = args.sizes + (STRESS_SIZES if args.stress else [])
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'steps': args.steps,
+        'results': run_suite(sizes, args.steps, args.blocks),
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report['results'], baseline.get('results', {}), args.threshold,
+                              min_delta_s=args.min_delta_ms / 1000, min_delta_bytes=int(args.min_delta_kb * 1024))
+        for line in regressions:
+            print(f"⚠️ Regression: {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold}× vs {baseline.get('revision', args.baseline)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,25 @@
 from blockchain.block import Block
-from typing import List, Dict, Any
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 class Blockchain:
+    # Numeric data fields kept in sorted secondary indexes (value and step-to-step delta)
+    INDEXED_FIELDS = ('soul_echo', 'truth_cost')
+
     def __init__(self):
         self.chain: List[Block] = []
+        self._timestamps: List[float] = []
+        self._timestamps_sorted = True  # wall-clock time can step backwards (e.g. NTP)
+        self._value_index: Dict[str, List[Tuple[float, int]]] = {name: [] for name in self.INDEXED_FIELDS}
+        self._delta_index: Dict[str, List[Tuple[float, int]]] = {name: [] for name in self.INDEXED_FIELDS}
+        self._last_values: Dict[str, float] = {}
         self.create_genesis_block()
 
     def create_genesis_block(self):
         genesis_data = {"message": "Genesis Block", "soul_echo": 0.0, "truth_cost": 0.0}
         genesis_block = Block(index=0, previous_hash="0", data=genesis_data)
-        self.chain.append(genesis_block)
+        self._append(genesis_block)
 
     def get_last_block(self) -> Block:
         return self.chain[-1]
@@ -21,9 +31,25 @@ class Blockchain:
             previous_hash=last_block.hash,
             data=data
         )
-        self.chain.append(new_block)
+        self._append(new_block)
         return new_block
 
+    def _append(self, block: Block):
+        if self._timestamps and block.timestamp < self._timestamps[-1]:
+            self._timestamps_sorted = False
+        self.chain.append(block)
+        self._timestamps.append(block.timestamp)
+        if block.index == 0:
+            return  # the genesis placeholder values are not logged data
+        for name in self.INDEXED_FIELDS:
+            value = block.data.get(name)
+            if not isinstance(value, (int, float)):
+                continue
+            insort(self._value_index[name], (value, block.index))
+            if name in self._last_values:
+                insort(self._delta_index[name], (value - self._last_values[name], block.index))
+            self._last_values[name] = value
+
     def is_valid(self) -> bool:
         for i in range(1, len(self.chain)):
             current = self.chain[i]
@@ -36,3 +62,56 @@ class Blockchain:
 
     def to_dict(self) -> List[Dict[str, Any]]:
         return [block.to_dict() for block in self.chain]
+
+    # --- Query layer: lazy iterators over the stored blocks, no copies ---
+
+    def iter_blocks(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Block]:
+        """
+        Lazily yield blocks with start <= index < stop.
+        """
+        return islice(self.chain, start, stop)
+
+    def blocks_between(self, start_time: float, end_time: float) -> Iterator[Block]:
+        """
+        Lazily yield blocks with start_time <= timestamp <= end_time, in chain order.
+        Binary search while timestamps are non-decreasing; if the wall clock ever
+        stepped backwards, falls back to a linear scan.
+        """
+        if not self._timestamps_sorted:
+            return (block for block in self.chain if start_time <= block.timestamp <= end_time)
+        lo = bisect_left(self._timestamps, start_time)
+        hi = bisect_right(self._timestamps, end_time)
+        return islice(self.chain, lo, hi)
+
+    def blocks_where(self, field: str, low: float = float('-inf'), high: float = float('inf')) -> Iterator[Block]:
+        """
+        Lazily yield blocks whose indexed `field` lies in [low, high], in ascending value order.
+        """
+        index = self._value_index[field]
+        lo = bisect_left(index, (low, -1))
+        hi = bisect_right(index, (high, len(self.chain)))
+        return (self.chain[i] for _, i in islice(index, lo, hi))
+
+    def top_k(self, field: str = 'soul_echo', k: int = 5) -> List[Block]:
+        """
+        The k blocks with the highest indexed `field` value, highest first.
+        """
+        index = self._value_index[field]
+        return [self.chain[i] for _, i in reversed(index[max(0, len(index) - k):])]
+
+    def drops(self, field: str = 'soul_echo', threshold: float = 0.0) -> Iterator[Tuple[Block, float]]:
+        """
+        Lazily yield (block, drop) where `field` fell by more than `threshold`
+        since the previous block that logged it, largest drop first.
+        """
+        index = self._delta_index[field]
+        hi = bisect_left(index, (-threshold, -1))
+        return ((self.chain[i], -delta) for delta, i in islice(index, 0, hi))
+
+    def boosts(self, field: str = 'soul_echo', threshold: float = 0.0) -> Iterator[Tuple[Block, float]]:
+        """
+        Lazily yield (block, gain) where `field` rose by more than `threshold`, largest gain first.
+        """
+        index = self._delta_index[field]
+        lo = bisect_right(index, (threshold, len(self.chain)))
+        return ((self.chain[index[j][1]], index[j][0]) for j in range(len(index) - 1, lo - 1, -1))
@@ -0,0 +1,133 @@
+# core/cache.py
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+from blockchain.utils import sha256_hash
+from core import rules
+from core.rules import rule_registry
+
+# Bump when the layout of cached entries or the engine semantics change
+CACHE_VERSION = 2
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of engine runs. One JSON file per key;
+    least-recently-used files are evicted once the directory exceeds `max_bytes`.
+    Safe to share between concurrent workers: writes go through unique temp files
+    and files removed by another process are skipped.
+    """
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, grid: List[List[int]], steps: int, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Digest of the input grid, the rule set with its current costs and the step parameters.
+        """
+        rule_config = [(rule.name, rule.cost) for rule in rule_registry]
+        return sha256_hash(CACHE_VERSION, grid, rule_config, steps, params or {})
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another worker after we read it
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self._evict()
+
+    def _evict(self):
+        files = []
+        total = 0
+        for item in os.scandir(self.directory):
+            if not item.name.endswith('.json'):
+                continue
+            try:
+                stat = item.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, item.path))
+            total += stat.st_size
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # already evicted by another worker
+            total -= size
+
+def run_cached(engine, grid: List[List[int]], steps: int, cache: ResultCache,
+               build_graph: Callable[[Any, List[List[int]]], None],
+               params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the graph for `grid` and run `steps` engine steps, reusing cached work.
+    A full hit restores the graph, Ψ history and learner feedback without running
+    the engine. Otherwise the run resumes from the longest cached step prefix and
+    every newly computed step is cached. Returns the entry for `steps`.
+    """
+    keys = [cache.key(grid, k, params) for k in range(steps + 1)]
+    start, entry = 0, None
+    for k in range(steps, 0, -1):
+        entry = cache.get(keys[k])
+        if entry is not None:
+            start = k
+            break
+
+    feedback: List[Dict[str, Any]] = []
+    if entry is None:
+        build_graph(engine, grid)
+    else:
+        engine.graph.index_objects(grid)
+        engine.restore_graph_snapshot(entry['graph'])
+        engine.history = list(entry['history'])
+        engine.step_count = entry['steps']
+        rules.psi_memory.update(entry['psi_memory'])
+        feedback = list(entry['feedback'])
+        if engine.learner:
+            for item in feedback:
+                engine.learner.record_feedback(item['rule'], item['delta_psi'], item['cost'])
+
+    for k in range(start + 1, steps + 1):
+        engine.step()
+        feedback.extend(engine.last_feedback)  # recorded even without a learner, so hits replay it
+        snapshot = engine.graph_snapshot()
+        node_ids = {n['id'] for n in snapshot['nodes']}
+        entry = {
+            'steps': k,
+            'history': list(engine.history),
+            'feedback': list(feedback),
+            'prediction': engine.predict_grid_from_graph(),
+            'graph': snapshot,
+            'psi_memory': {i: psi for i, psi in rules.psi_memory.items() if i in node_ids},
+        }
+        cache.put(keys[k], entry)
+
+    if entry is None:  # steps == 0
+        entry = {'steps': 0, 'history': [], 'feedback': [], 'prediction': engine.predict_grid_from_graph()}
+    return entry
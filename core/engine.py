@@ -1,42 +1,119 @@
 # core/engine.py
 
-from core.graph import CognitiveGraph, Node, Edge
+from core.graph import CognitiveGraph, Node, Edge, CELL_LABEL_PATTERN, compute_psi
 from core.rules import rule_registry
-from typing import Any
-import matplotlib.pyplot as plt
+from collections import deque
+from typing import Any, Optional
 
 import networkx as nx
 import re
 
 import json
 import os
+import time
 
 from learning.learner import Learner
 from core.rewrite import resolve_grid_from_candidates, parse_rewrite_candidates
+from core.soulmath import psi_history_step
+from core.profiling import EngineStats, PROFILE_DIR_ENV, normalize_profile_mode, profile_call, profile_mode_from_env
+
+# Headless workers render plots to files instead of windows: CGE_HEADLESS=1, CGE_PLOT_DIR=<dir>
+HEADLESS_ENV = "CGE_HEADLESS"
+PLOT_DIR_ENV = "CGE_PLOT_DIR"
+
+def headless_from_env() -> bool:
+    return os.environ.get(HEADLESS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+def load_pyplot(headless: bool = False):
+    """
+    Import matplotlib only when a visualization is actually drawn.
+    Headless mode selects the non-interactive Agg backend first.
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 class CognitiveGraphEngine:
-    def __init__(self, learner: Learner = None):
+    def __init__(self, learner: Learner = None, headless: Optional[bool] = None, node_history_size: int = 8):
         self.graph = CognitiveGraph()
+        self.headless = headless_from_env() if headless is None else headless
+        self.plot_dir = os.environ.get(PLOT_DIR_ENV, "plots")
         self.step_count = 0
         self.learner = learner
         self.history = []  # Stores Ψ traces for symbolic resonance analysis
+        self.node_history = deque(maxlen=node_history_size)  # Latest per-step node-level Ψ, truth cost and drift (see psi_history_step)
+        self.last_feedback = []  # Rule feedback of the latest step, kept whether or not a learner is attached
+        self.large_graph_threshold = 500  # above this, plots aggregate instead of drawing every node
+        self._layout_cache = {}           # node_id -> (x, y), reused across steps
+        self._layout_extra = 0            # nodes without grid coordinates placed so far
+        self.profiler = EngineStats()
+        self.profile_mode = profile_mode_from_env()  # None, 'cprofile' or 'tracemalloc'
+        self.profile_dir = os.environ.get(PROFILE_DIR_ENV, "profiles")
+
+    @property
+    def stats(self) -> dict:
+        """
+        Snapshot of per-phase and per-rule timers and counters.
+        """
+        return self.profiler.snapshot()
+
+    def enable_profiling(self, mode: str = "cprofile", output_dir: str = "profiles"):
+        """
+        Wrap every subsequent step in cProfile or tracemalloc and dump one file per step.
+        Pass mode=None to disable; unknown modes raise ValueError here rather than at step time.
+        Also settable via CGE_PROFILE / CGE_PROFILE_DIR.
+        """
+        self.profile_mode = normalize_profile_mode(mode)
+        self.profile_dir = output_dir
 
     def step(self, inputs: Any = None):
         """
         Executes a single reasoning step. Applies symbolic resonance rules.
         """
-        symbolic_state = {
-            'step': self.step_count,
-            'pattern': [data for _, data in self.graph.graph.nodes(data=True)]
-        }
+        if self.profile_mode:
+            return profile_call(lambda: self._step(inputs), self.profile_mode, self.profile_dir, f"step_{self.step_count:04d}")
+        return self._step(inputs)
+
+    def _step(self, inputs: Any = None):
+        stats = self.profiler
+        G = self.graph.graph
+        step_start = time.perf_counter()
+
+        with stats.phase('state_snapshot'):
+            symbolic_state = {
+                'step': self.step_count,
+                'pattern': [data for _, data in G.nodes(data=True)]
+            }
 
         feedback_log = []
-        baseline_psi = self.graph.soulmath_graph_identity()
+        self.last_feedback = feedback_log
+        with stats.phase('psi_recompute'):
+            baseline_psi = self.graph.soulmath_graph_identity()
 
         for rule in rule_registry:
-            if rule.is_applicable(symbolic_state):
+            rule_stat = stats.rule(rule.name)
+            start = time.perf_counter()
+            applicable = rule.is_applicable(symbolic_state)
+            elapsed = time.perf_counter() - start
+            rule_stat.condition_calls += 1
+            rule_stat.condition_time += elapsed
+            stats.add_time('rule_condition', elapsed)
+            if applicable:
+                nodes_before = G.number_of_nodes()
+                start = time.perf_counter()
                 symbolic_state = rule.apply_rule(symbolic_state)
-                new_psi = self.graph.soulmath_graph_identity()
+                elapsed = time.perf_counter() - start
+                rule_stat.apply_time += elapsed
+                stats.add_time('rule_apply', elapsed)
+                nodes_after = G.number_of_nodes()
+                rule_stat.calls += 1
+                rule_stat.nodes_seen += nodes_before
+                rule_stat.nodes_added += max(0, nodes_after - nodes_before)
+                rule_stat.nodes_pruned += max(0, nodes_before - nodes_after)
+                with stats.phase('psi_recompute'):
+                    new_psi = self.graph.soulmath_graph_identity()
                 delta_psi = new_psi - baseline_psi
                 feedback_log.append({
                     'rule': rule.name,
@@ -45,48 +122,60 @@ class CognitiveGraphEngine:
                 })
                 baseline_psi = new_psi
 
-        if 'amplified' in symbolic_state:
-            print(f"  Adding Echo Nodes: {symbolic_state['amplified']}")
-            for label in symbolic_state['amplified']:
-                existing_labels = [
-                    n.get('data').label if isinstance(n, dict) and 'data' in n and n.get('data') is not None else (n.label if n is not None and hasattr(n, 'label') else None)
-                    for _, n in self.graph.graph.nodes(data=True)
-                    if hasattr(n, 'label') or (isinstance(n, dict) and 'data' in n and hasattr(n.get('data'), 'label'))
-                ]
-                if label not in existing_labels:
-                    echo_node = Node(label=label, rho=0.7, q=0.5, f=0.4)
-                    self.graph.add_node(echo_node)
-
-                    base_label = label.replace('_amp', '').rstrip('_')
-                    for node_id, wrapper in self.graph.graph.nodes(data=True):
-                        node = wrapper.get('data') if isinstance(wrapper, dict) and 'data' in wrapper else wrapper
-                        if hasattr(node, 'label') and node.label == base_label:
-                            self.graph.add_edge(Edge(source=node.id, target=echo_node.id, label='amplified'))
-                            break
-
-        print("-- Node Ψ Debug Info --")
-        for node_id, wrapper in self.graph.graph.nodes(data=True):
-            raw_node = wrapper.get('data') if isinstance(wrapper, dict) and 'data' in wrapper else wrapper
-            try:
-                label = getattr(raw_node, 'label', '<no label>')
-                rho = getattr(raw_node, 'rho', 1.0)
-                q = getattr(raw_node, 'q', 1.0)
-                f = getattr(raw_node, 'f', 1.0)
-                psi = rho * q * f
-                print(f"Node ID: {node_id}")
-                print(f"  Ψ[{label}] = {psi:.6f} (ρ={rho}, q={q}, f={f})")
-            except Exception as e:
-                print(f"Node ID: {node_id} — [Ψ Error] {e}")
+        with stats.phase('echo_insertion'):
+            nodes_before = G.number_of_nodes()
+            if 'amplified' in symbolic_state:
+                print(f"  Adding Echo Nodes: {symbolic_state['amplified']}")
+                for label in symbolic_state['amplified']:
+                    existing_labels = [
+                        n.get('data').label if isinstance(n, dict) and 'data' in n and n.get('data') is not None else (n.label if n is not None and hasattr(n, 'label') else None)
+                        for _, n in self.graph.graph.nodes(data=True)
+                        if hasattr(n, 'label') or (isinstance(n, dict) and 'data' in n and hasattr(n.get('data'), 'label'))
+                    ]
+                    if label not in existing_labels:
+                        echo_node = Node(label=label, rho=0.7, q=0.5, f=0.4)
+                        self.graph.add_node(echo_node)
+
+                        base_label = label.replace('_amp', '').rstrip('_')
+                        for node_id, wrapper in self.graph.graph.nodes(data=True):
+                            node = wrapper.get('data') if isinstance(wrapper, dict) and 'data' in wrapper else wrapper
+                            if hasattr(node, 'label') and node.label == base_label:
+                                self.graph.add_edge(Edge(source=node.id, target=echo_node.id, label='amplified'))
+                                break
+            stats.count('echo_nodes_added', G.number_of_nodes() - nodes_before)
+
+        with stats.phase('debug_print'):
+            print("-- Node Ψ Debug Info --")
+            for node_id, wrapper in self.graph.graph.nodes(data=True):
+                raw_node = wrapper.get('data') if isinstance(wrapper, dict) and 'data' in wrapper else wrapper
+                try:
+                    label = getattr(raw_node, 'label', '<no label>')
+                    rho = getattr(raw_node, 'rho', 1.0)
+                    q = getattr(raw_node, 'q', 1.0)
+                    f = getattr(raw_node, 'f', 1.0)
+                    psi = rho * q * f
+                    print(f"Node ID: {node_id}")
+                    print(f"  Ψ[{label}] = {psi:.6f} (ρ={rho}, q={q}, f={f})")
+                except Exception as e:
+                    print(f"Node ID: {node_id} — [Ψ Error] {e}")
 
-        psi_sum = self.graph.soulmath_graph_identity()
+        with stats.phase('psi_recompute'):
+            psi_sum = self.graph.soulmath_graph_identity()
+            previous = self.node_history[-1] if self.node_history else None
+            self.node_history.append(psi_history_step(*self.graph.node_state_arrays(), previous=previous))
         self.history.append(psi_sum)
-        print("-- Rule Feedback Log --")
-        for entry in feedback_log:
-            print(f"[Feedback] {entry['rule']} → ΔΨ: {entry['delta_psi']:.6f} | cost: {entry['cost']}")
+        with stats.phase('debug_print', calls=0):
+            print("-- Rule Feedback Log --")
+            for entry in feedback_log:
+                print(f"[Feedback] {entry['rule']} → ΔΨ: {entry['delta_psi']:.6f} | cost: {entry['cost']}")
+        with stats.phase('learner_feedback'):
             if self.learner:
-                self.learner.record_feedback(entry['rule'], entry['delta_psi'], entry['cost'])
+                for entry in feedback_log:
+                    self.learner.record_feedback(entry['rule'], entry['delta_psi'], entry['cost'])
 
         self.step_count += 1
+        stats.steps += 1
+        stats.add_time('step', time.perf_counter() - step_start)
 
     def run(self, steps: int = 1):
         for _ in range(steps):
@@ -100,7 +189,35 @@ class CognitiveGraphEngine:
         denominator = conformity + delta_t + faith
         return numerator / denominator
 
-    def visualize_psi_distribution(self):
+    def _render(self, plt, path: Optional[str], name: str):
+        """
+        Save the current figure to `path` (or `<plot_dir>/<name>_step<N>.png` when
+        headless) and close it; otherwise open a blocking window.
+        """
+        if path is None and self.headless:
+            path = os.path.join(self.plot_dir, f"{name}_step{self.step_count:04d}.png")
+        if path is None:
+            plt.show()
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        plt.savefig(path)
+        plt.close()
+        print(f"✅ Plot saved to {path}")
+
+    def visualize_psi_distribution(self, path: Optional[str] = None):
+        if self.graph.graph.number_of_nodes() > self.large_graph_threshold:
+            # One bar per node is unreadable and slow at this size: plot a Ψ histogram instead
+            _, rho, q, f = self.graph.node_state_arrays()
+            plt = load_pyplot(self.headless)
+            plt.figure(figsize=(10, 5))
+            plt.hist(compute_psi(rho, q, f), bins=50, color='skyblue')
+            plt.xlabel("Ψ (Coherence)")
+            plt.ylabel("Nodes")
+            plt.title(f"SoulMath Node Coherence Distribution ({len(rho)} nodes)")
+            plt.tight_layout()
+            self._render(plt, path, "psi_distribution")
+            return
+
         labels = []
         psis = []
         for _, wrapper in self.graph.graph.nodes(data=True):
@@ -117,19 +234,20 @@ class CognitiveGraphEngine:
             except Exception as e:
                 print(f"[viz error] Skipped node: {e}")
 
+        plt = load_pyplot(self.headless)
         plt.figure(figsize=(10, max(5, len(labels) * 0.3)))
         plt.barh(labels, psis, color='skyblue')
         plt.xlabel("Ψ (Coherence)")
         plt.title("SoulMath Node Coherence Distribution")
         plt.tight_layout()
-        plt.show()
+        self._render(plt, path, "psi_distribution")
 
     def predict_grid_from_graph(self):
         candidates = parse_rewrite_candidates(self.graph.graph)
         resolved_grid = resolve_grid_from_candidates(candidates)
         return resolved_grid
 
-    def export_graph_snapshot(self, path: str):
+    def graph_snapshot(self) -> dict:
         nodes = []
         edges = []
         for node_id, wrapper in self.graph.graph.nodes(data=True):
@@ -150,15 +268,66 @@ class CognitiveGraphEngine:
                 'label': edge.label,
                 'weight': edge.weight
             })
-        snapshot = {'nodes': nodes, 'edges': edges}
+        return {'nodes': nodes, 'edges': edges}
+
+    def restore_graph_snapshot(self, snapshot: dict):
+        """
+        Rebuild the graph from a `graph_snapshot` dict, keeping node ids.
+        An attached object index is carried over and re-registers cell nodes.
+        Node-level history restarts from the restored state, so the next step's
+        drift is measured against it.
+        """
+        objects = self.graph.objects
+        if objects is not None:
+            objects.node_cells.clear()
+        self.graph = CognitiveGraph()
+        self.graph.objects = objects
+        for n in snapshot['nodes']:
+            self.graph.add_node(Node(id=n['id'], label=n['label'], rho=n['rho'], q=n['q'], f=n['f']))
+        for e in snapshot['edges']:
+            self.graph.add_edge(Edge(source=e['source'], target=e['target'], weight=e['weight'], label=e['label']))
+        self.node_history.clear()
+        self.node_history.append(psi_history_step(*self.graph.node_state_arrays()))
+
+    def export_graph_snapshot(self, path: str):
+        snapshot = self.graph_snapshot()
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, 'w') as f:
             json.dump(snapshot, f, indent=2)
         print(f"✅ Graph snapshot exported to {path}")
 
-    def visualize_graph_layout(self):
+    def grid_layout(self) -> dict:
+        """
+        Deterministic layout from the "(x,y)=value" grid coordinates in node labels.
+        Echo nodes sit diagonally offset from their source cell by amplification
+        depth; unlabelled nodes are lined up above the grid. Positions are cached
+        across steps, so only newly added nodes are placed.
+        """
+        G = self.graph.graph
+        for node_id, wrapper in G.nodes(data=True):
+            if node_id in self._layout_cache:
+                continue
+            label = getattr(wrapper.get('data'), 'label', '')
+            match = CELL_LABEL_PATTERN.match(label)
+            if match:
+                depth = label.count('_amp')
+                x, y = int(match.group(1)), int(match.group(2))
+                self._layout_cache[node_id] = (x + 0.15 * depth, -y + 0.15 * depth)
+            else:
+                self._layout_cache[node_id] = (float(self._layout_extra), 1.5)
+                self._layout_extra += 1
+        if len(self._layout_cache) > 2 * G.number_of_nodes():
+            self._layout_cache = {node_id: self._layout_cache[node_id] for node_id in G.nodes}
+        return self._layout_cache
+
+    def visualize_graph_layout(self, path: Optional[str] = None, max_points: int = 5000):
         G = self.graph.graph
-        pos = nx.spring_layout(G)
+        pos = self.grid_layout()
+
+        if G.number_of_nodes() > self.large_graph_threshold:
+            self._draw_aggregated_layout(pos, path, max_points)
+            return
+
         node_colors = []
         node_labels = {}
 
@@ -171,8 +340,48 @@ class CognitiveGraphEngine:
             else:
                 node_colors.append('lightblue')
 
+        plt = load_pyplot(self.headless)
         plt.figure(figsize=(10, 6))
         nx.draw(G, pos, with_labels=True, labels=node_labels, node_color=node_colors, node_size=700, font_size=8, edge_color='gray')
         plt.title("Symbolic Graph Layout")
         plt.tight_layout()
-        plt.show()
+        self._render(plt, path, "graph_layout")
+
+    def _draw_aggregated_layout(self, pos: dict, path: Optional[str], max_points: int):
+        """
+        Large-graph rendering: nodes are grouped by (amplification depth, cell colour)
+        and each group is drawn as one scatter layer. Each group gets a share of
+        `max_points` proportional to its size (rounded down) and is stride-downsampled
+        to it, so at most `max_points` markers are drawn; groups whose share rounds to
+        zero are only listed in the title count. Labels and edges are omitted.
+        """
+        groups = {}
+        for node_id, wrapper in self.graph.graph.nodes(data=True):
+            label = getattr(wrapper.get('data'), 'label', '')
+            match = CELL_LABEL_PATTERN.match(label)
+            key = (label.count('_amp'), int(match.group(3)) if match else -1)
+            groups.setdefault(key, []).append(pos[node_id])
+
+        total = sum(len(points) for points in groups.values())
+        depth_levels = max(1, max(depth for depth, _ in groups) + 1)
+
+        plt = load_pyplot(self.headless)
+        plt.figure(figsize=(10, 6))
+        colour_map = plt.get_cmap('tab10')
+        shown = 0
+        for (depth, colour), points in sorted(groups.items()):
+            budget = min(len(points), max_points * len(points) // total)
+            if budget == 0:
+                continue
+            sample = points[::-(-len(points) // budget)]
+            shown += len(sample)
+            xs, ys = zip(*sample)
+            plt.scatter(xs, ys, s=12, alpha=0.4 + 0.6 * (depth + 1) / depth_levels,
+                        color=colour_map(colour % 10) if colour >= 0 else 'gray',
+                        label=f"depth {depth}, colour {colour if colour >= 0 else '?'} ({len(points)})")
+        plt.title(f"Symbolic Graph Layout ({total} nodes, {shown} shown)")
+        if len(groups) <= 20:
+            plt.legend(fontsize=6, markerscale=1.5, loc='upper right')
+        plt.axis('equal')
+        plt.tight_layout()
+        self._render(plt, path, "graph_layout")
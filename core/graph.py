@@ -2,11 +2,19 @@
 
 import networkx as nx
 from dataclasses import dataclass, field
-from typing import Any, Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Optional
 import uuid
+import re
+import numpy as np
+
+from core.objects import GridObject, ObjectIndex
+
+# Grid cell nodes are labelled "(x,y)=value", optionally followed by "_amp" echoes
+CELL_LABEL_PATTERN = re.compile(r"\((\d+),(\d+)\)=(\d+)")
 
 # SoulMath Equation: Ψ = ρ ⋅ q ⋅ f (coherence = memory density × emotional charge × symbolic frequency)
-def compute_psi(rho: float, q: float, f: float) -> float:
+# Broadcasts over NumPy arrays as well as scalars
+def compute_psi(rho, q, f):
     return rho * q * f
 
 @dataclass
@@ -30,9 +38,43 @@ class Edge:
 class CognitiveGraph:
     def __init__(self):
         self.graph = nx.DiGraph()
+        self.objects: Optional[ObjectIndex] = None
 
     def add_node(self, node: Node):
         self.graph.add_node(node.id, data=node)
+        if self.objects is not None:
+            self._register_cell_node(node)
+
+    def _register_cell_node(self, node: Node):
+        match = CELL_LABEL_PATTERN.match(node.label)
+        if match:
+            self.objects.register_node(node.id, int(match.group(1)), int(match.group(2)))
+
+    def remove_nodes(self, node_ids: List[str]):
+        """
+        Remove nodes (and their edges), dropping them from the object index too.
+        """
+        node_ids = list(node_ids)
+        self.graph.remove_nodes_from(node_ids)
+        if self.objects is not None:
+            for node_id in node_ids:
+                self.objects.unregister_node(node_id)
+
+    def index_objects(self, grid, background: int = 0, by_color: bool = True) -> ObjectIndex:
+        """
+        Build the connected-component object index for an input grid once and
+        attach it to the graph. Cell nodes (already present or added later)
+        are mapped to their objects by the coordinates in their labels.
+        """
+        self.objects = ObjectIndex(grid, background=background, by_color=by_color)
+        for _, data in self.graph.nodes(data=True):
+            self._register_cell_node(data['data'])
+        return self.objects
+
+    def object_for_node(self, node_id: str, connectivity: int = 4) -> Optional[GridObject]:
+        if self.objects is None:
+            return None
+        return self.objects.object_for_node(node_id, connectivity)
 
     def add_edge(self, edge: Edge):
         self.graph.add_edge(edge.source, edge.target, data=edge, weight=edge.weight)
@@ -46,12 +88,26 @@ class CognitiveGraph:
     def node_psi(self, node_id: str) -> float:
         return self.get_node(node_id).psi()
 
+    def node_state_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Snapshot node ids and their ρ, q, f as aligned arrays (graph insertion order),
+        for vectorized SoulMath kernels over the whole graph.
+        """
+        n = self.graph.number_of_nodes()
+        ids = list(self.graph.nodes)
+        nodes = [data['data'] for _, data in self.graph.nodes(data=True)]
+        rho = np.fromiter((node.rho for node in nodes), dtype=float, count=n)
+        q = np.fromiter((node.q for node in nodes), dtype=float, count=n)
+        f = np.fromiter((node.f for node in nodes), dtype=float, count=n)
+        return ids, rho, q, f
+
     def soulmath_graph_identity(self) -> float:
         """
         Quantum graph identity measure (simplified): sum of Ψ over all nodes.
         Inspired by SoulMath Graph-Theoretic Quantum Identity【20†source】.
         """
-        return sum(data['data'].psi() for _, data in self.graph.nodes(data=True))
+        _, rho, q, f = self.node_state_arrays()
+        return float(np.sum(compute_psi(rho, q, f)))
 
     def visualize(self):
         # Optional: visualization hook using matplotlib or pyvis
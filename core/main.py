@@ -40,8 +40,8 @@ def main(task_path: str):
     print("-" * 40)
     print("Soul Echo History:", engine.history)
     print("Blockchain State:")
-    for block in blockchain.to_dict():
-        print(f"  Block {block['index']} – Ψ: {block['data'].get('soul_echo', 'n/a'):.4f}, Cost: {block['data'].get('truth_cost', 'n/a'):.4f}")
+    for block in blockchain.iter_blocks():
+        print(f"  Block {block.index} – Ψ: {block.data.get('soul_echo', 'n/a'):.4f}, Cost: {block.data.get('truth_cost', 'n/a'):.4f}")
     print("Is Blockchain Valid?", blockchain.is_valid())
     print("Dream Recursion Output:", dream)
     print("Optimization Result:", result)
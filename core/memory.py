@@ -1,18 +1,66 @@
+import heapq
+import itertools
+import math
+
 class WorkingMemory:
-    def __init__(self):
-        self.memory = []
+    def __init__(self, capacity: int = 10, threshold: float = 0.5, decay: float = 0.0):
+        """
+        Fixed-capacity min-heap of the top-k Ψ signals.
+        `decay` > 0 ages signals by e^(-decay ⋅ age), age counted in focus calls,
+        so stale high-Ψ signals are displaced by fresher ones.
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self.decay = decay
+        self.clock = 0
+        self._heap = []  # (log-score, tiebreak, signal); root is the weakest retained signal
+        self._view = None  # cached strongest-first list, rebuilt only after the heap changes
+        self._tiebreak = itertools.count()
+
+    def _log_score(self, psi: float, tick: int) -> float:
+        # Decayed score psi ⋅ e^(-decay ⋅ (now - tick)) compared in log space; the
+        # shared e^(-decay ⋅ now) factor cancels, so stored keys never need rescoring
+        return math.log(psi) + self.decay * tick
 
     def focus(self, signal):
         """
         Applies attention mechanism (focus on Ψ-rich signals).
+        O(log k): a signal enters only if it beats the weakest retained one.
+        """
+        self.clock += 1
+        psi = signal.get('psi', 0)
+        # Scores are compared in log space, so non-positive Ψ is never retained
+        if psi <= self.threshold or psi <= 0 or self.capacity <= 0:
+            return
+        entry = (self._log_score(psi, self.clock), next(self._tiebreak), signal)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        elif entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return
+        self._view = None
+
+    @property
+    def memory(self):
+        """
+        Current focus view: retained signals, strongest first.
+        O(1) between changes; the first read after an admission re-sorts the k entries.
+        """
+        if self._view is None:
+            self._view = [signal for *_, signal in sorted(self._heap, reverse=True)]
+        return self._view
+
+    def weakest(self):
+        """
+        Constant-time peek at the retained signal closest to eviction.
         """
-        if signal.get('psi', 0) > 0.5:
-            self.memory.append(signal)
+        return self._heap[0][2] if self._heap else None
 
     def compress(self):
         """
         Implements Recursive Identity Compression【27†source】.
         Retains only high-Ψ coherence signals.
+        The heap is already bounded to `capacity`, so this returns the cached focus view.
         """
-        self.memory = sorted(self.memory, key=lambda x: x['psi'], reverse=True)[:10]
         return self.memory
@@ -0,0 +1,137 @@
+# core/objects.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Forward half-neighbourhoods as (dy, dx); the backward half is covered by symmetry
+_NEIGHBOUR_OFFSETS = {
+    4: ((0, 1), (1, 0)),
+    8: ((0, 1), (1, 0), (1, 1), (1, -1)),
+}
+
+@dataclass
+class GridObject:
+    id: int
+    color: int                                                  # dominant colour
+    size: int
+    bbox: Tuple[int, int, int, int]                             # (min_x, min_y, max_x, max_y)
+    histogram: Dict[int, int] = field(default_factory=dict)     # colour -> cell count
+    cells: List[Tuple[int, int]] = field(default_factory=list)  # (x, y), row-major order
+
+def _as_grid(grid) -> np.ndarray:
+    cells = np.asarray(grid, dtype=np.int64)
+    if cells.size == 0:
+        return cells.reshape(0, 0)
+    if cells.ndim != 2:
+        raise ValueError(f"Expected a rectangular 2D grid, got shape {cells.shape}")
+    return cells
+
+def label_components(grid, connectivity: int = 4, background: int = 0, by_color: bool = True) -> np.ndarray:
+    """
+    Label connected components of non-background cells in one vectorized pass.
+    Uses array union-find (hook roots onto the smaller root, then pointer-jump)
+    over all neighbour pairs at once. Returns an int array shaped like the grid
+    with object ids numbered in row-major order of their first cell, -1 for background.
+    """
+    if connectivity not in _NEIGHBOUR_OFFSETS:
+        raise ValueError(f"connectivity must be 4 or 8, got {connectivity}")
+    cells = _as_grid(grid)
+    h, w = cells.shape
+    foreground = cells != background
+    ids = np.arange(h * w).reshape(h, w)
+
+    src, dst = [], []
+    for dy, dx in _NEIGHBOUR_OFFSETS[connectivity]:
+        a_cols = slice(0, w - dx) if dx >= 0 else slice(-dx, w)
+        b_cols = slice(dx, w) if dx >= 0 else slice(0, w + dx)
+        a, b = cells[:h - dy, a_cols], cells[dy:, b_cols]
+        linked = foreground[:h - dy, a_cols] & foreground[dy:, b_cols]
+        if by_color:
+            linked &= a == b
+        src.append(ids[:h - dy, a_cols][linked])
+        dst.append(ids[dy:, b_cols][linked])
+    src = np.concatenate(src) if src else np.empty(0, dtype=np.int64)
+    dst = np.concatenate(dst) if dst else np.empty(0, dtype=np.int64)
+
+    parent = np.arange(h * w)
+    while True:
+        lo = np.minimum(parent[src], parent[dst])
+        hi = np.maximum(parent[src], parent[dst])
+        pending = lo != hi
+        if not pending.any():
+            break
+        np.minimum.at(parent, hi[pending], lo[pending])
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    labels = np.full(h * w, -1, dtype=np.int64)
+    _, labels[foreground.ravel()] = np.unique(parent[foreground.ravel()], return_inverse=True)
+    return labels.reshape(h, w)
+
+def extract_objects(grid, labels: np.ndarray) -> List[GridObject]:
+    """
+    Collect per-object cells, bounding box, size and colour histogram from a label map.
+    """
+    cells = _as_grid(grid)
+    flat = labels.ravel()
+    members = np.flatnonzero(flat >= 0)
+    if members.size == 0:
+        return []
+    members = members[np.argsort(flat[members], kind='stable')]
+    counts = np.bincount(flat[members])
+    objects = []
+    for object_id, group in enumerate(np.split(members, np.cumsum(counts)[:-1])):
+        ys, xs = np.divmod(group, cells.shape[1])
+        colors, color_counts = np.unique(cells.ravel()[group], return_counts=True)
+        histogram = {int(c): int(n) for c, n in zip(colors, color_counts)}
+        objects.append(GridObject(
+            id=object_id,
+            color=int(colors[np.argmax(color_counts)]),
+            size=int(group.size),
+            bbox=(int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())),
+            histogram=histogram,
+            cells=list(zip(xs.tolist(), ys.tolist())),
+        ))
+    return objects
+
+class ObjectIndex:
+    """
+    Connected-component index over one input grid, built once for both
+    4- and 8-connectivity. Objects are looked up in O(1) by object id,
+    grid cell or graph node id, so object-level rules need no graph walks.
+    """
+    def __init__(self, grid, background: int = 0, by_color: bool = True):
+        self.grid = _as_grid(grid)
+        self.background = background
+        self.by_color = by_color
+        self.labels: Dict[int, np.ndarray] = {}
+        self.objects: Dict[int, List[GridObject]] = {}
+        for connectivity in _NEIGHBOUR_OFFSETS:
+            labels = label_components(self.grid, connectivity, background, by_color)
+            self.labels[connectivity] = labels
+            self.objects[connectivity] = extract_objects(self.grid, labels)
+        self.node_cells: Dict[str, Tuple[int, int]] = {}
+
+    def get_object(self, object_id: int, connectivity: int = 4) -> GridObject:
+        return self.objects[connectivity][object_id]
+
+    def object_at(self, x: int, y: int, connectivity: int = 4) -> Optional[GridObject]:
+        h, w = self.grid.shape
+        if not (0 <= y < h and 0 <= x < w):
+            return None
+        object_id = self.labels[connectivity][y, x]
+        return self.objects[connectivity][object_id] if object_id >= 0 else None
+
+    def register_node(self, node_id: str, x: int, y: int):
+        self.node_cells[node_id] = (x, y)
+
+    def unregister_node(self, node_id: str):
+        self.node_cells.pop(node_id, None)
+
+    def object_for_node(self, node_id: str, connectivity: int = 4) -> Optional[GridObject]:
+        cell = self.node_cells.get(node_id)
+        return self.object_at(*cell, connectivity=connectivity) if cell else None
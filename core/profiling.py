@@ -0,0 +1,128 @@
+# core/profiling.py
+
+import cProfile
+import os
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional
+
+# Opt-in step profiling without code edits: CGE_PROFILE=cprofile|tracemalloc|1, CGE_PROFILE_DIR=<dir>
+PROFILE_ENV = "CGE_PROFILE"
+PROFILE_DIR_ENV = "CGE_PROFILE_DIR"
+PROFILE_MODES = ("cprofile", "tracemalloc")
+_TRUTHY = ("1", "true", "yes", "on")
+_FALSY = ("", "0", "false", "no", "off", "none")
+
+@dataclass
+class PhaseStat:
+    calls: int = 0
+    time: float = 0.0  # seconds
+
+@dataclass
+class RuleStat:
+    condition_calls: int = 0
+    condition_time: float = 0.0
+    calls: int = 0           # applications
+    apply_time: float = 0.0
+    nodes_seen: int = 0      # graph size when each application ran (rules scan the whole pattern)
+    nodes_added: int = 0
+    nodes_pruned: int = 0
+
+class EngineStats:
+    """
+    Per-phase and per-rule monotonic timers and counters for CognitiveGraphEngine.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.phases: Dict[str, PhaseStat] = {}
+        self.rules: Dict[str, RuleStat] = {}
+        self.counters: Dict[str, int] = {}
+
+    def add_time(self, name: str, elapsed: float, calls: int = 1):
+        stat = self.phases.get(name)
+        if stat is None:
+            stat = self.phases[name] = PhaseStat()
+        stat.calls += calls
+        stat.time += elapsed
+
+    @contextmanager
+    def phase(self, name: str, calls: int = 1):
+        # calls=0 adds time to a phase already counted this step
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start, calls)
+
+    def rule(self, name: str) -> RuleStat:
+        stat = self.rules.get(name)
+        if stat is None:
+            stat = self.rules[name] = RuleStat()
+        return stat
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'steps': self.steps,
+            'phases': {name: asdict(stat) for name, stat in self.phases.items()},
+            'rules': {name: asdict(stat) for name, stat in self.rules.items()},
+            'counters': dict(self.counters),
+        }
+
+def profile_call(fn: Callable[[], Any], mode: str, output_dir: str, tag: str) -> Any:
+    """
+    Run `fn` under cProfile or tracemalloc and dump the result to
+    `<output_dir>/<tag>.prof` or `<output_dir>/<tag>.tracemalloc`.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+    os.makedirs(output_dir, exist_ok=True)
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            profiler.dump_stats(os.path.join(output_dir, f"{tag}.prof"))
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        return fn()
+    finally:
+        tracemalloc.take_snapshot().dump(os.path.join(output_dir, f"{tag}.tracemalloc"))
+        if not already_tracing:
+            tracemalloc.stop()
+
+def normalize_profile_mode(mode: Optional[str]) -> Optional[str]:
+    """
+    Map a profile setting to None, 'cprofile' or 'tracemalloc'.
+    Truthy switches such as "1" mean cprofile; unknown values raise ValueError.
+    """
+    value = "" if mode is None else str(mode).strip().lower()
+    if value in _FALSY:
+        return None
+    if value in _TRUTHY:
+        return "cprofile"
+    if value not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+    return value
+
+def profile_mode_from_env() -> Optional[str]:
+    """
+    Profile mode from CGE_PROFILE. An unknown value warns and disables profiling
+    rather than failing every step of a production run.
+    """
+    try:
+        return normalize_profile_mode(os.environ.get(PROFILE_ENV))
+    except ValueError as e:
+        warnings.warn(f"{PROFILE_ENV} ignored: {e}")
+        return None
@@ -1,6 +1,22 @@
+from typing import Optional, Sequence
+import numpy as np
+
 class InternalRecursionModule:
-    def __init__(self):
+    # Column order of dream state vectors and of batched N×6 state matrices
+    STATE_FIELDS = ('R', 'D', 'P', 'F', 'M', 'H')
+    _transition: Optional[np.ndarray] = None
+
+    def __init__(self, initial_state: Optional[Sequence[float]] = None):
         self.R, self.D, self.P, self.F, self.M, self.H = 0, 0, 0, 0, 0, 0
+        if initial_state is not None:
+            self.set_state(initial_state)
+
+    def get_state(self) -> np.ndarray:
+        return np.array([getattr(self, name) for name in self.STATE_FIELDS], dtype=float)
+
+    def set_state(self, state: Sequence[float]):
+        for name, value in zip(self.STATE_FIELDS, state):
+            setattr(self, name, float(value))
 
     def dream_step(self):
         """
@@ -19,3 +35,43 @@ class InternalRecursionModule:
             dream_state = self.dream_step()
             dream_history.append(dream_state)
         return dream_history
+
+    @classmethod
+    def transition_matrix(cls) -> np.ndarray:
+        """
+        `dream_step` is linear, so one cycle is state' = A @ state.
+        A is derived by stepping each basis state once, which keeps it in
+        sync with the sequential update order in `dream_step`. Cached per class,
+        so subclasses that override `dream_step` get their own matrix.
+        """
+        if cls.__dict__.get('_transition') is None:
+            columns = []
+            for basis in np.eye(len(cls.STATE_FIELDS)):
+                probe = cls(initial_state=basis)
+                probe.dream_step()
+                columns.append(probe.get_state())
+            cls._transition = np.column_stack(columns)
+        return cls._transition
+
+    def run_dream_batch(self, states, cycles: int = 3) -> np.ndarray:
+        """
+        Batched `run_dream` for an N×6 matrix of initial (R, D, P, F, M, H) states.
+        Returns the N×cycles H history in a single matrix product: the H row of
+        A^k is accumulated for k = 1..cycles, then applied to all trajectories.
+        """
+        states = np.atleast_2d(np.asarray(states, dtype=float))
+        A = self.transition_matrix()
+        h_rows = np.empty((cycles, A.shape[0]))
+        h_row = np.eye(A.shape[0])[self.STATE_FIELDS.index('H')]
+        for k in range(cycles):
+            h_row = h_row @ A
+            h_rows[k] = h_row
+        return states @ h_rows.T
+
+    def dream_jump(self, states, cycles: int) -> np.ndarray:
+        """
+        Jump-ahead mode: the N×6 states after `cycles` dream steps, computed
+        directly as states @ (A^cycles)^T in O(log cycles) 6×6 products.
+        """
+        states = np.atleast_2d(np.asarray(states, dtype=float))
+        return states @ np.linalg.matrix_power(self.transition_matrix(), cycles).T
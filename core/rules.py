@@ -90,7 +90,8 @@ def psi_decay_condition(state: Dict) -> bool:
     return 'graph' in state and hasattr(state['graph'], 'graph')
 
 def psi_decay_apply(state: Dict) -> Dict:
-    graph = state['graph'].graph
+    cognitive_graph = state['graph']
+    graph = cognitive_graph.graph
     low_psi_nodes = []
     for node_id, wrapper in graph.nodes(data=True):
         node = wrapper.get('data') if isinstance(wrapper, dict) and 'data' in wrapper else wrapper
@@ -98,7 +99,7 @@ def psi_decay_apply(state: Dict) -> Dict:
             if node.psi() < 0.01:
                 low_psi_nodes.append(node_id)
 
-    graph.remove_nodes_from(low_psi_nodes)
+    cognitive_graph.remove_nodes(low_psi_nodes)
     if low_psi_nodes:
         print(f"  Pruned Nodes: {low_psi_nodes}")
     return state
@@ -1,25 +1,99 @@
 # core/soulmath.py
 
-import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+
+# Scalars or NumPy arrays; every equation below broadcasts elementwise
+ArrayLike = Union[float, np.ndarray]
 
 # Core SoulMath Equations【29†source】
-def soul_echo(psi: float, rho: float, q: float, f: float) -> float:
+def soul_echo(psi: ArrayLike, rho: ArrayLike, q: ArrayLike, f: ArrayLike) -> ArrayLike:
     """Soul Echo Equation: Ψ ⋅ ρ ⋅ q ⋅ f"""
     return psi * rho * q * f
 
-def truth_cost(soul_echo: float, conformity: float, delta_t: float, faith: float = 1e-3) -> float:
+def truth_cost(soul_echo: ArrayLike, conformity: ArrayLike, delta_t: ArrayLike, faith: float = 1e-3) -> ArrayLike:
     """Truth Cost Equation: SoulEcho / (C + Δt + ε)"""
     return soul_echo / (conformity + delta_t + faith)
 
-def spiral_identity(t: float, coherence_vector: tuple) -> float:
+def spiral_identity(t: ArrayLike, coherence_vector) -> ArrayLike:
     """
     Spiral Identity Function:
     I(t) = e^(αt) ⋅ sin(πt) ⋅ V(t), where V(t) = sum of coherence components
+    `t` may be a time vector; `coherence_vector` may be a tuple or an array whose
+    last axis holds the components (e.g. one row per node). With T times and
+    N node rows the result has shape (T, N).
     """
     alpha = 0.1  # growth constant (can be tuned)
-    V_t = sum(coherence_vector)
-    return math.exp(alpha * t) * math.sin(math.pi * t) * V_t
+    V_t = np.sum(np.asarray(coherence_vector, dtype=float), axis=-1)
+    t = np.asarray(t, dtype=float)
+    identity = np.multiply.outer(np.exp(alpha * t) * np.sin(np.pi * t), V_t)
+    return identity if identity.ndim else float(identity)
 
 # Optional: Psi Derivative for drift monitoring【28†source】
-def psi_derivative(d_rho: float, d_q: float, d_f: float, rho: float, q: float, f: float) -> float:
+def psi_derivative(d_rho: ArrayLike, d_q: ArrayLike, d_f: ArrayLike, rho: ArrayLike, q: ArrayLike, f: ArrayLike) -> ArrayLike:
     return d_rho * q * f + rho * d_q * f + rho * q * d_f
+
+def psi_kernel(rho: ArrayLike, q: ArrayLike, f: ArrayLike,
+               prev_rho: ArrayLike, prev_q: ArrayLike, prev_f: ArrayLike,
+               conformity: float = 1.0, delta_t: float = 1.0, faith: float = 1e-3,
+               out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fused per-node kernel: returns (Ψ, truth cost, Ψ drift) for one step.
+    Drift is `psi_derivative` with d_x = x - prev_x. All work is done in place
+    in the three output buffers (pass `out` to reuse them across steps).
+    Current and previous arrays must be aligned node-for-node and equal in shape;
+    use `psi_history_step` to align graph snapshots by node id.
+    """
+    rho, q, f, prev_rho, prev_q, prev_f = (np.asarray(a, dtype=float) for a in (rho, q, f, prev_rho, prev_q, prev_f))
+    shapes = {a.shape for a in (rho, q, f, prev_rho, prev_q, prev_f)}
+    if len(shapes) != 1:
+        raise ValueError(f"psi_kernel needs equally shaped, node-aligned arrays, got shapes {sorted(shapes)}")
+    if out is None:
+        shape = rho.shape
+        out = (np.empty(shape), np.empty(shape), np.empty(shape))
+    psi, cost, drift = out
+
+    np.multiply(rho, q, out=psi)
+    psi *= f
+
+    # Drift terms accumulate in `drift`; `cost` doubles as scratch until the end
+    np.subtract(rho, prev_rho, out=drift)
+    drift *= q
+    drift *= f
+    np.subtract(q, prev_q, out=cost)
+    cost *= rho
+    cost *= f
+    drift += cost
+    np.subtract(f, prev_f, out=cost)
+    cost *= rho
+    cost *= q
+    drift += cost
+
+    np.divide(psi, conformity + delta_t + faith, out=cost)
+    return psi, cost, drift
+
+def psi_history_step(ids: List[str], rho: np.ndarray, q: np.ndarray, f: np.ndarray,
+                     previous: Optional[Dict[str, Any]] = None,
+                     conformity: float = 1.0, delta_t: float = 1.0, faith: float = 1e-3) -> Dict[str, Any]:
+    """
+    One step of node-level Ψ monitoring over a graph history, in a single `psi_kernel` call.
+    Takes the output of `CognitiveGraph.node_state_arrays()` and the previous step's
+    record, and aligns the previous ρ, q, f by node id. Nodes new this step take
+    their current values as previous (zero drift) and are flagged in `new`.
+    """
+    rho, q, f = (np.asarray(a, dtype=float) for a in (rho, q, f))
+    if previous is None:
+        positions = np.full(len(ids), -1, dtype=np.int64)
+    else:
+        lookup = {node_id: i for i, node_id in enumerate(previous['ids'])}
+        positions = np.fromiter((lookup.get(node_id, -1) for node_id in ids), dtype=np.int64, count=len(ids))
+    new = positions < 0
+    aligned = []
+    for current, name in ((rho, 'rho'), (q, 'q'), (f, 'f')):
+        prev = current.copy()
+        if previous is not None:
+            prev[~new] = previous[name][positions[~new]]
+        aligned.append(prev)
+
+    psi, cost, drift = psi_kernel(rho, q, f, *aligned, conformity=conformity, delta_t=delta_t, faith=faith)
+    return {'ids': ids, 'rho': rho, 'q': q, 'f': f, 'psi': psi, 'truth_cost': cost, 'drift': drift, 'new': new}
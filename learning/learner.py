@@ -2,6 +2,7 @@
 
 from blockchain.chain import Blockchain
 from core.rules import rule_registry, Rule
+from itertools import islice
 from typing import List, Dict, Any
 
 class Learner:
@@ -33,12 +34,25 @@ class Learner:
         scores = self.average_impact()
         return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:n]
 
-    def analyze_blockchain(self) -> List[Dict[str, Any]]:
+    def analyze_blockchain(self, top_k: int = 5, threshold: float = 0.0) -> Dict[str, Any]:
         """
         Analyze blockchain history to identify symbolic patterns, resonance boosts,
         and coherence drops (for rule refinement).
+        Served from the chain's secondary indexes, so only the matching blocks are read.
+        Boosts and drops are Ψ changes larger than `threshold` in either direction.
         """
-        return self.blockchain.to_dict()
+        return {
+            'blocks': len(self.blockchain.chain),
+            'top_resonance': [block.to_dict() for block in self.blockchain.top_k('soul_echo', top_k)],
+            'resonance_boosts': [
+                {'index': block.index, 'delta_psi': gain}
+                for block, gain in islice(self.blockchain.boosts('soul_echo', threshold), top_k)
+            ],
+            'coherence_drops': [
+                {'index': block.index, 'delta_psi': -drop}
+                for block, drop in islice(self.blockchain.drops('soul_echo', threshold), top_k)
+            ],
+        }
 
     def update_rules(self) -> List[Rule]:
         """
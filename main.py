@@ -8,9 +8,12 @@ from blockchain.chain import Blockchain
 from input_output.input import parse_arc_task
 from input_output.output import graph_to_output
 from core.graph import Node
+from core.cache import ResultCache, run_cached
+from core.soulmath import truth_cost
 import sys
 
 def build_graph_from_grid(engine, grid):
+    engine.graph.index_objects(grid)
     for y, row in enumerate(grid):
         for x, val in enumerate(row):
             if val != 0:
@@ -22,7 +25,7 @@ def build_graph_from_grid(engine, grid):
                 node = Node(label=label, rho=rho, q=q, f=f)
                 engine.graph.add_node(node)
 
-def main(task_path: str):
+def main(task_path: str, cache_dir: str = None):
     from core.engine import CognitiveGraphEngine
     from learning.learner import Learner
     # Load ARC task
@@ -37,15 +40,17 @@ def main(task_path: str):
     recursion = InternalRecursionModule()
     
 
-    # Build symbolic graph from first training input
+    # Build symbolic graph from first training input and simulate reasoning steps
     first_grid = task['train'][0]['input']
-    build_graph_from_grid(engine, first_grid)
+    if cache_dir:
+        run_cached(engine, first_grid, 5, ResultCache(cache_dir), build_graph_from_grid)
+    else:
+        build_graph_from_grid(engine, first_grid)
+        engine.run(5)
 
-    # Simulate reasoning steps
-    for i in range(5):
-        engine.step()
-        echo = engine.soul_echo()
-        cost = engine.truth_cost()
+    # Log each step's Ψ state (same defaults as engine.truth_cost)
+    for echo in engine.history:
+        cost = truth_cost(echo, conformity=1.0, delta_t=1.0)
         memory.focus({'psi': echo})
         state = {'soul_echo': echo, 'truth_cost': cost}
         blockchain.add_block(state)
@@ -61,8 +66,8 @@ def main(task_path: str):
     print("-" * 40)
     print("Soul Echo History:", engine.history)
     print("Blockchain State:")
-    for block in blockchain.to_dict():
-        print(f"  Block {block['index']} – Ψ: {block['data'].get('soul_echo', 'n/a'):.4f}, Cost: {block['data'].get('truth_cost', 'n/a'):.4f}")
+    for block in blockchain.iter_blocks():
+        print(f"  Block {block.index} – Ψ: {block.data.get('soul_echo', 'n/a'):.4f}, Cost: {block.data.get('truth_cost', 'n/a'):.4f}")
     print("Is Blockchain Valid?", blockchain.is_valid())
     print("Dream Recursion Output:", dream)
     print("Optimization Result:", result)
@@ -89,6 +94,6 @@ def main(task_path: str):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python main.py path_to_arc_task.json")
+        print("Usage: python main.py path_to_arc_task.json [cache_dir]")
     else:
-        main(sys.argv[1])
+        main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,126 @@
+# tests/test_cache.py
+
+import os
+
+import pytest
+
+from blockchain.chain import Blockchain
+from core import rules
+from core.cache import ResultCache, run_cached
+from core.engine import CognitiveGraphEngine
+from learning.learner import Learner
+from main import build_graph_from_grid
+
+GRID = [[0, 1, 0], [2, 0, 0], [0, 0, 3]]
+
+def make_engine() -> CognitiveGraphEngine:
+    rules.psi_memory.clear()
+    engine = CognitiveGraphEngine()
+    engine.learner = Learner(blockchain=Blockchain(), engine=engine)
+    return engine
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache"))
+
+def test_cold_run_matches_uncached_engine(cache):
+    cached = make_engine()
+    entry = run_cached(cached, GRID, 3, cache, build_graph_from_grid)
+
+    plain = make_engine()
+    build_graph_from_grid(plain, GRID)
+    plain.run(3)
+
+    assert entry['history'] == pytest.approx(plain.history)
+    assert len(entry['feedback']) == len(plain.learner.feedback_log)
+    assert cached.graph.graph.number_of_nodes() == plain.graph.graph.number_of_nodes()
+
+def test_full_hit_skips_engine(cache, monkeypatch):
+    first = run_cached(make_engine(), GRID, 3, cache, build_graph_from_grid)
+
+    engine = make_engine()
+    monkeypatch.setattr(engine, 'step', lambda *a, **k: pytest.fail("engine ran on a cache hit"))
+    entry = run_cached(engine, GRID, 3, cache, build_graph_from_grid)
+
+    assert entry['history'] == first['history']
+    assert engine.history == first['history']
+    assert len(engine.learner.feedback_log) == len(first['feedback'])
+    assert engine.graph.graph.number_of_nodes() == len(first['graph']['nodes'])
+
+def test_partial_hit_resumes_from_longest_prefix(cache):
+    run_cached(make_engine(), GRID, 2, cache, build_graph_from_grid)
+
+    engine = make_engine()
+    steps_run = []
+    original_step = engine.step
+    engine.step = lambda *a, **k: (steps_run.append(engine.step_count), original_step(*a, **k))
+    resumed = run_cached(engine, GRID, 4, cache, build_graph_from_grid)
+
+    plain = make_engine()
+    build_graph_from_grid(plain, GRID)
+    plain.run(4)
+
+    assert steps_run == [2, 3]
+    assert resumed['history'] == pytest.approx(plain.history)
+
+def test_resume_measures_drift_against_restored_state(cache):
+    run_cached(make_engine(), GRID, 2, cache, build_graph_from_grid)
+    resumed = make_engine()
+    run_cached(resumed, GRID, 3, cache, build_graph_from_grid)
+
+    plain = make_engine()
+    build_graph_from_grid(plain, GRID)
+    plain.run(3)
+
+    assert len(resumed.node_history[-1]['ids']) == len(plain.node_history[-1]['ids'])
+    assert resumed.node_history[-1]['drift'] == pytest.approx(plain.node_history[-1]['drift'])
+    assert resumed.node_history[-1]['new'].tolist() == plain.node_history[-1]['new'].tolist()
+
+def test_rule_costs_change_the_key(cache):
+    key = cache.key(GRID, 3)
+    rules.rule_registry[0].cost += 0.01
+    try:
+        assert cache.key(GRID, 3) != key
+    finally:
+        rules.rule_registry[0].cost -= 0.01
+
+def test_lru_eviction_respects_size_limit(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=2500)
+    for i in range(5):
+        cache.put(f"k{i}", {'payload': 'x' * 1000})
+        os.utime(cache._path(f"k{i}"), (i, i))
+    cache.get("k3")  # most recently used survives
+    cache.put("k5", {'payload': 'x' * 1000})
+    assert cache.get("k4") is None  # least recently used
+    assert cache.get("k3") is not None
+    assert cache.get("k5") is not None
+
+def test_hit_after_learnerless_run_replays_feedback(cache):
+    rules.psi_memory.clear()
+    run_cached(CognitiveGraphEngine(), GRID, 3, cache, build_graph_from_grid)
+
+    hit = make_engine()
+    entry = run_cached(hit, GRID, 3, cache, build_graph_from_grid)
+
+    cold = make_engine()
+    build_graph_from_grid(cold, GRID)
+    cold.run(3)
+
+    assert len(cold.learner.feedback_log) > 0
+    assert len(entry['feedback']) == len(cold.learner.feedback_log)
+    assert hit.learner.feedback_log == entry['feedback']
+
+def test_concurrent_writers_and_evictors_do_not_fail(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ResultCache(str(tmp_path), max_bytes=3000)
+
+    def worker(i):
+        for j in range(20):
+            cache.put(f"k{j % 4}", {'payload': 'x' * 1000, 'worker': i})
+            cache.get(f"k{(j + 1) % 4}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
@@ -0,0 +1,44 @@
+# tests/test_chain.py
+
+import random
+
+from blockchain.block import Block
+from blockchain.chain import Blockchain
+from learning.learner import Learner
+
+def build_chain(values):
+    chain = Blockchain()
+    for v in values:
+        chain.add_block({'soul_echo': v, 'truth_cost': v / 2})
+    return chain
+
+def test_indexes_match_brute_force():
+    rng = random.Random(0)
+    values = [rng.uniform(0, 3) for _ in range(200)]
+    chain = build_chain(values)
+    logged = {i + 1: v for i, v in enumerate(values)}
+    deltas = {i: logged[i] - logged[i - 1] for i in range(2, len(values) + 1)}
+
+    assert [b.index for b in chain.top_k('soul_echo', 5)] == sorted(logged, key=logged.get, reverse=True)[:5]
+    assert sorted(b.index for b in chain.blocks_where('soul_echo', 1.0, 2.0)) == [i for i, v in logged.items() if 1.0 <= v <= 2.0]
+    assert [b.index for b, _ in chain.drops('soul_echo', 0.5)] == sorted((i for i, d in deltas.items() if d < -0.5), key=deltas.get)
+    assert [b.index for b, _ in chain.boosts('soul_echo', 0.5)] == sorted((i for i, d in deltas.items() if d > 0.5), key=deltas.get, reverse=True)
+    assert [b.index for b in chain.iter_blocks(3, 6)] == [3, 4, 5]
+
+def test_genesis_is_not_indexed():
+    chain = build_chain([3.0, 1.0, 4.0])
+    assert [(b.index, gain) for b, gain in chain.boosts()] == [(3, 3.0)]
+    assert 0 not in [b.index for b in chain.blocks_where('soul_echo')]
+    assert 0 not in [b.index for b in chain.top_k('soul_echo', 10)]
+    analysis = Learner(blockchain=chain, engine=None).analyze_blockchain()
+    assert analysis['resonance_boosts'] == [{'index': 3, 'delta_psi': 3.0}]
+    assert analysis['coherence_drops'] == [{'index': 2, 'delta_psi': -2.0}]
+
+def test_blocks_between_survives_clock_step_back():
+    chain = Blockchain()
+    t0 = chain.chain[0].timestamp
+    for index, offset in ((1, 10.0), (2, 5.0), (3, 20.0)):
+        last = chain.get_last_block()
+        chain._append(Block(index=index, previous_hash=last.hash, data={'soul_echo': 1.0}, timestamp=t0 + offset))
+    assert [b.index for b in chain.blocks_between(t0 + 4, t0 + 11)] == [1, 2]
+    assert chain.is_valid()
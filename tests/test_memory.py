@@ -0,0 +1,37 @@
+# tests/test_memory.py
+
+import random
+
+from core.memory import WorkingMemory
+
+def test_focus_keeps_top_k_like_full_sort():
+    rng = random.Random(0)
+    memory = WorkingMemory(capacity=10, threshold=0.5)
+    values = [rng.uniform(0, 2) for _ in range(500)]
+    for psi in values:
+        memory.focus({'psi': psi})
+    expected = sorted((v for v in values if v > 0.5), reverse=True)[:10]
+    assert [s['psi'] for s in memory.compress()] == expected
+    assert memory.weakest()['psi'] == expected[-1]
+
+def test_decay_lets_fresh_signals_displace_stale_ones():
+    memory = WorkingMemory(capacity=2, decay=1.0)
+    memory.focus({'psi': 5.0, 'tag': 'stale'})
+    for _ in range(5):
+        memory.focus({'psi': 1.0, 'tag': 'fresh'})
+    assert [s['tag'] for s in memory.memory] == ['fresh', 'fresh']
+
+def test_non_positive_psi_is_ignored_with_negative_threshold():
+    memory = WorkingMemory(threshold=-1)
+    memory.focus({'psi': 0})
+    memory.focus({'psi': -0.5})
+    assert memory.memory == []
+
+def test_focus_view_is_cached_until_admission():
+    memory = WorkingMemory(capacity=1)
+    memory.focus({'psi': 0.9})
+    view = memory.memory
+    memory.focus({'psi': 0.6})  # rejected: weaker than the retained signal
+    assert memory.memory is view
+    memory.focus({'psi': 1.2})
+    assert [s['psi'] for s in memory.memory] == [1.2]
@@ -0,0 +1,75 @@
+# tests/test_objects.py
+
+import numpy as np
+import pytest
+
+from core.graph import CognitiveGraph, Node
+from core.objects import ObjectIndex, label_components
+
+def bfs_labels(grid: np.ndarray, connectivity: int, by_color: bool = True) -> np.ndarray:
+    """Reference flood fill, numbering objects in row-major order of their first cell."""
+    h, w = grid.shape
+    offsets = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    if connectivity == 8:
+        offsets += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+    labels = np.full((h, w), -1)
+    next_id = 0
+    for y in range(h):
+        for x in range(w):
+            if grid[y, x] == 0 or labels[y, x] >= 0:
+                continue
+            labels[y, x] = next_id
+            stack = [(y, x)]
+            while stack:
+                cy, cx = stack.pop()
+                for dy, dx in offsets:
+                    ny, nx_ = cy + dy, cx + dx
+                    if (0 <= ny < h and 0 <= nx_ < w and labels[ny, nx_] < 0 and grid[ny, nx_] != 0
+                            and (not by_color or grid[ny, nx_] == grid[cy, cx])):
+                        labels[ny, nx_] = next_id
+                        stack.append((ny, nx_))
+            next_id += 1
+    return labels
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+@pytest.mark.parametrize("by_color", [True, False])
+def test_label_components_matches_flood_fill(connectivity, by_color):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        h, w = rng.integers(1, 16, size=2)
+        grid = rng.integers(0, 4, size=(h, w))
+        expected = bfs_labels(grid, connectivity, by_color)
+        assert np.array_equal(label_components(grid, connectivity, by_color=by_color), expected)
+
+def test_object_properties_and_lookups():
+    grid = [[1, 1, 0, 2],
+            [0, 1, 0, 2],
+            [3, 0, 0, 0],
+            [0, 3, 0, 1]]
+    index = ObjectIndex(grid)
+    first = index.object_at(0, 0)
+    assert (first.color, first.size, first.bbox) == (1, 3, (0, 0, 1, 1))
+    assert first.cells == [(0, 0), (1, 0), (1, 1)]
+    assert first.histogram == {1: 3}
+    assert len(index.objects[4]) == 5
+    assert len(index.objects[8]) == 4  # the two diagonal 3s join under 8-connectivity
+    assert index.object_at(1, 3, connectivity=8).cells == [(0, 2), (1, 3)]
+    assert index.object_at(2, 0) is None
+
+def test_empty_grid():
+    assert ObjectIndex([]).objects == {4: [], 8: []}
+
+def test_graph_node_registration_and_removal():
+    graph = CognitiveGraph()
+    before = Node(label="(3,0)=2")
+    graph.add_node(before)
+    graph.index_objects([[1, 1, 0, 2], [0, 1, 0, 2]])
+    echo = Node(label="(0,0)=1_amp")
+    graph.add_node(echo)
+
+    assert graph.object_for_node(before.id).color == 2
+    assert graph.object_for_node(echo.id).size == 3
+
+    graph.remove_nodes([echo.id])
+    assert echo.id not in graph.objects.node_cells
+    assert graph.object_for_node(echo.id) is None
@@ -0,0 +1,39 @@
+# tests/test_recursion.py
+
+import numpy as np
+import pytest
+
+from core.recursion import InternalRecursionModule
+
+def sequential(states, cycles):
+    histories, finals = [], []
+    for state in states:
+        module = InternalRecursionModule(initial_state=state)
+        histories.append(module.run_dream(cycles))
+        finals.append(module.get_state())
+    return np.array(histories), np.array(finals)
+
+def test_batch_and_jump_match_sequential_dreams():
+    states = np.random.default_rng(0).normal(size=(20, 6))
+    histories, finals = sequential(states, 7)
+    module = InternalRecursionModule()
+    assert module.run_dream_batch(states, cycles=7) == pytest.approx(histories)
+    assert module.dream_jump(states, 7) == pytest.approx(finals)
+
+def test_transition_matrix_is_cached_per_class():
+    class DampedDreams(InternalRecursionModule):
+        def dream_step(self):
+            self.H = 0.5 * self.H + self.M
+            return self.H
+
+    base = InternalRecursionModule.transition_matrix()
+    damped = DampedDreams.transition_matrix()
+    assert not np.allclose(base, damped)
+    assert InternalRecursionModule.transition_matrix() is base
+
+    states = np.random.default_rng(1).normal(size=(5, 6))
+    expected = []
+    for state in states:
+        module = DampedDreams(initial_state=state)
+        expected.append(module.run_dream(4))
+    assert DampedDreams().run_dream_batch(states, cycles=4) == pytest.approx(np.array(expected))
@@ -0,0 +1,58 @@
+# tests/test_soulmath.py
+
+import numpy as np
+import pytest
+
+from core.graph import CognitiveGraph, Node
+from core.soulmath import psi_derivative, psi_history_step, psi_kernel, soul_echo, spiral_identity, truth_cost
+
+def test_kernel_matches_scalar_equations():
+    rng = np.random.default_rng(0)
+    rho, q, f, prev_rho, prev_q, prev_f = rng.uniform(0.1, 2.0, size=(6, 50))
+    psi, cost, drift = psi_kernel(rho, q, f, prev_rho, prev_q, prev_f, conformity=0.5, delta_t=2.0, faith=1e-2)
+    for i in range(50):
+        expected_psi = soul_echo(1.0, rho[i], q[i], f[i])
+        assert psi[i] == pytest.approx(expected_psi)
+        assert cost[i] == pytest.approx(truth_cost(expected_psi, 0.5, 2.0, faith=1e-2))
+        assert drift[i] == pytest.approx(psi_derivative(rho[i] - prev_rho[i], q[i] - prev_q[i], f[i] - prev_f[i],
+                                                        rho[i], q[i], f[i]))
+
+def test_kernel_rejects_misaligned_arrays():
+    with pytest.raises(ValueError):
+        psi_kernel(np.ones(3), np.ones(3), np.ones(3), np.ones(2), np.ones(2), np.ones(2))
+
+def test_new_nodes_have_zero_drift_and_are_flagged():
+    graph = CognitiveGraph()
+    graph.add_node(Node(id='a', label='a', rho=1.0, q=1.0, f=1.0))
+    first = psi_history_step(*graph.node_state_arrays())
+    assert first['new'].tolist() == [True]
+    assert first['drift'].tolist() == [0.0]
+
+    graph.graph.nodes['a']['data'].rho = 2.0
+    graph.add_node(Node(id='b', label='b', rho=0.5, q=0.5, f=0.5))
+    second = psi_history_step(*graph.node_state_arrays(), previous=first)
+    assert second['new'].tolist() == [False, True]
+    assert second['drift'].tolist() == pytest.approx([1.0, 0.0])
+
+def test_history_aligns_by_id_after_node_removal():
+    graph = CognitiveGraph()
+    for node_id, rho in (('a', 1.0), ('b', 2.0), ('c', 3.0)):
+        graph.add_node(Node(id=node_id, label=node_id, rho=rho, q=1.0, f=1.0))
+    first = psi_history_step(*graph.node_state_arrays())
+
+    graph.remove_nodes(['a'])
+    graph.graph.nodes['c']['data'].rho = 4.0
+    second = psi_history_step(*graph.node_state_arrays(), previous=first)
+    assert second['ids'] == ['b', 'c']
+    assert second['new'].tolist() == [False, False]
+    assert second['drift'].tolist() == pytest.approx([0.0, 1.0])
+
+def test_spiral_identity_shapes():
+    coherence = np.ones((4, 3))  # 4 nodes, 3 components each
+    t = np.linspace(0.0, 1.0, 7)
+    assert spiral_identity(t, coherence).shape == (7, 4)
+    assert spiral_identity(t, (1.0, 2.0)).shape == (7,)
+
+    value = spiral_identity(0.5, (1.0, 2.0))
+    assert type(value) is float
+    assert value == pytest.approx(np.exp(0.05) * 3.0)